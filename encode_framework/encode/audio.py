@@ -1,33 +1,369 @@
+import hashlib
+import json
+import os
 import shutil
-from typing import Any, Literal, cast
-
-from vsmuxtools import (AudioFile, AudioTrack, AutoEncoder, Encoder, FFMpeg,
-                        HasTrimmer, frame_to_ms, get_workdir)
+import subprocess
+from collections import Counter
+from copy import copy
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from numbers import Real
+from operator import itemgetter
+from threading import Lock
+from typing import Any, Iterable, Iterator, Literal, cast
+
+from vsmuxtools import (AudioFile, AudioTrack, AutoEncoder, AutoTrimmer,
+                        Encoder, FFMpeg, GlobSearch, HasTrimmer, do_audio,
+                        format_from_track, frame_to_ms, frames_to_samples,
+                        get_workdir, is_fancy_codec, parse_m2ts_path)
 from vstools import (CustomIndexError, CustomNotImplementedError,
                      CustomRuntimeError, CustomValueError, FileNotExistsError,
                      FileType, SPath, SPathLike, vs)
 
+from ..script import ScriptInfo
+from ..util.files import stat_cache
 from ..util.logging import Log
+from ..util.mediainfo import get_mediainfo
 from .base import _BaseEncoder
 
+try:
+    from fcntl import ioctl
+except ImportError:  # Windows
+    ioctl = None  # type:ignore[assignment]
+
 __all__: list[str] = [
     "_AudioEncoder"
 ]
 
 
+_SKIP_SUFFIXES = frozenset({
+    ".log", ".sup", ".ttf", ".otf", ".ttc", ".wob", ".dgi", ".dgim", ".d2v", ".lwi", ".py", ".vpy",
+})
+"""Suffixes of files sitting next to DGIndex(NV) demuxes that should never be probed as audio."""
+
+_AUDIO_SUFFIXES = frozenset({
+    ".aac", ".ac3", ".dts", ".dtshd", ".eac3", ".flac", ".m4a", ".mka", ".mp2", ".mp3", ".opus", ".thd", ".w64", ".wav",
+})
+"""Suffixes of files sitting next to DGIndex(NV) demuxes that are always audio, so they don't need probing."""
+
+_PROBE_CACHE_NAME = "audio_probe_cache.json"
+"""Name of the file in the workdir that remembers which DGIndex(NV) demuxes are audio files."""
+
+_AUDIO_MAGIC: tuple[tuple[int, bytes], ...] = (
+    (0, b"\x7f\xfe\x80\x01"),  # DTS
+    (0, b"\xfe\x7f\x01\x80"),  # DTS (little endian)
+    (0, b"\x0b\x77"),  # AC-3 / E-AC-3
+    (0, b"fLaC"),  # FLAC
+    (4, b"\xf8\x72\x6f\xba"),  # TrueHD
+    (8, b"WAVE"),  # WAV (RIFF/RF64)
+    (8, b"M4A "),  # M4A
+    (28, b"OpusHead"),  # Opus in Ogg
+)
+"""Byte offsets and signatures of common audio formats, used to skip a full MediaInfo probe."""
+
+_FICLONE = 0x40049409
+"""Linux ioctl that makes a file share the data of another file (a reflink) on copy-on-write filesystems."""
+
+_HASH_CHUNK_SIZE = 1 << 20
+"""Number of leading bytes hashed to tell same-sized audio files apart before hashing them in full."""
+
+_CACHE_KEY_SUFFIX = ".key"
+"""Suffix of the sidecar next to a trimmed file, holding the key of the inputs that produced it."""
+
+_PLAIN_TYPES = (str, Real, type(None))
+"""Types of encoder and trimmer settings that have the same repr in every run, unlike most objects."""
+
+_FINGERPRINT_LENGTH = 120
+"""How many seconds of audio to fingerprint when looking for acoustic duplicates."""
+
+_FINGERPRINT_MAX_ERROR = 0.05
+"""Maximum fraction of differing fingerprint bits for two tracks to be considered duplicates."""
+
+_ENCODER_CODECS: dict[str, str] = {"qaac": "qaac", "flac": "libflac", "opus": "libopus"}
+"""ffmpeg codec names for the supported audio encoders, keyed by lowercase encoder class name."""
+
+
+def _as_spath(path: SPathLike) -> SPath:
+    """Only build a new SPath if the given path isn't one already."""
+    return path if isinstance(path, SPath) else SPath(path)
+
+
+@stat_cache(maxsize=32)
+def _get_m2ts_path(dgi_file: str) -> SPath:
+    """Get the m2ts file a DGIndexNV file was made from, only reading the index again if it changed."""
+    return _as_spath(parse_m2ts_path(SPath(dgi_file)))
+
+
+def _hash_file(path: SPathLike, limit: int | None = None) -> bytes:
+    """Hash a file (or only its first `limit` bytes), without reading it into memory at once."""
+    with open(path, "rb") as f:
+        # file_digest reads into one reusable buffer, rather than allocating a new bytes object for every chunk.
+        if limit is None:
+            return hashlib.file_digest(f, "blake2b").digest()
+
+        return hashlib.blake2b(f.read(limit)).digest()
+
+
+def _trim_cache_key(audio_file: SPathLike, *params: Any) -> str | None:
+    """Key a trimmed file on its source (size and mtime) and every setting that goes into making it."""
+    try:
+        st = os.stat(audio_file)
+    except OSError:
+        return None
+
+    return hashlib.blake2b(repr((st.st_size, st.st_mtime_ns, *params)).encode(), digest_size=16).hexdigest()
+
+
+def _settings_key(obj: Any) -> Any:
+    """Describe an encoder or trimmer by its type and plain settings, so it keys the same in every run."""
+    if obj is None or isinstance(obj, (bool, type)):
+        return getattr(obj, "__qualname__", obj)
+
+    settings = sorted(
+        (k, v) for k, v in getattr(obj, "__dict__", {}).items()
+        if not k.startswith("_") and (
+            isinstance(v, _PLAIN_TYPES)
+            or isinstance(v, (tuple, list)) and all(isinstance(x, _PLAIN_TYPES) for x in v)
+        )
+    )
+
+    return type(obj).__qualname__, repr(settings)
+
+
+def _make_trimmer(trimmer: Any) -> Any:
+    """Turn the `trimmer` argument of `encode_audio` into a new trimmer instance that `do_audio` can take."""
+    if trimmer is False:
+        return None
+
+    if trimmer is None:
+        return AutoTrimmer()
+
+    # Tool classes like FFMpeg hold their trimmer as a nested class.
+    if isinstance(trimmer, HasTrimmer) or isinstance(trimmer, type) and issubclass(trimmer, HasTrimmer):
+        trimmer = trimmer.Trimmer  # type:ignore[union-attr]
+
+    # do_audio sets the trims on the trimmer itself, so tracks must never share one.
+    return trimmer() if isinstance(trimmer, type) else copy(trimmer)
+
+
+def _read_cache_key(trimmed_file: SPath) -> str | None:
+    try:
+        return trimmed_file.with_name(trimmed_file.name + _CACHE_KEY_SUFFIX).read_text().strip()
+    except OSError:
+        return None
+
+
+@stat_cache(maxsize=128)
+def _fingerprint_audio(path: str) -> tuple[int, ...]:
+    """Get the raw Chromaprint fingerprint of the start of an audio file. Returns an empty tuple if fpcalc fails."""
+    proc = subprocess.run(
+        ["fpcalc", "-raw", "-json", "-length", str(_FINGERPRINT_LENGTH), path], capture_output=True, text=True
+    )
+
+    if proc.returncode:
+        return ()
+
+    return tuple(json.loads(proc.stdout or "{}").get("fingerprint", []))
+
+
+@stat_cache(maxsize=128)
+def _pcm_digest(path: str) -> bytes | None:
+    """Hash the decoded audio of a file, ignoring the container and any metadata. Returns None if ffmpeg fails."""
+    if not (ffmpeg := shutil.which("ffmpeg")):
+        return None
+
+    h = hashlib.blake2b()
+
+    # Decoded at the source's own channel layout and sample rate, so downmixes and resamples still count as different.
+    with subprocess.Popen(
+        [ffmpeg, "-v", "error", "-i", path, "-map", "0:a:0", "-f", "s16le", "-"], stdout=subprocess.PIPE
+    ) as proc:
+        assert proc.stdout is not None
+
+        while chunk := proc.stdout.read(_HASH_CHUNK_SIZE):
+            h.update(chunk)
+
+    return None if proc.returncode else h.digest()
+
+
+def _fingerprint_error_rate(a: tuple[int, ...], b: tuple[int, ...]) -> float:
+    """Get the fraction of bits that differ between two raw fingerprints, over the length they share."""
+    if not (length := min(len(a), len(b))):
+        return 1.0
+
+    # Older fpcalc versions print signed values, so mask to 32 bits before counting.
+    return sum(((x ^ y) & 0xFFFFFFFF).bit_count() for x, y in zip(a, b)) / (32 * length)
+
+
+def _sniff_audio(path: SPathLike) -> bool:
+    """Check whether the first few bytes of a file match a common audio format signature."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(36)
+    except OSError:
+        return False
+
+    return any(head.startswith(magic, offset) for offset, magic in _AUDIO_MAGIC)
+
+
+def _is_acopy(name: str) -> bool:
+    """Whether a file name belongs to a copy made by the acopy workaround (`.acopy` or `{name}.acopy.{track}`)."""
+    return name.endswith(".acopy") or ".acopy." in name
+
+
+def _link_or_copy(src: SPathLike, dst: SPathLike) -> None:
+    """
+    Hardlink a file, falling back to a reflink and then a full copy if that isn't possible (e.g. across filesystems).
+    An existing destination is replaced, since it may hold the data of another file.
+
+    A hardlink keeps the data around even if the original path gets deleted, without writing it to disk twice.
+    """
+    try:
+        os.unlink(dst)
+    except FileNotFoundError:
+        pass
+
+    try:
+        os.link(src, dst)
+    except OSError:
+        if not _reflink(src, dst):
+            shutil.copy(src, dst)
+
+
+def _reflink(src: SPathLike, dst: SPathLike) -> bool:
+    """Clone a file on copy-on-write filesystems (btrfs, XFS), so it doesn't have to be written twice."""
+    if ioctl is None:
+        return False
+
+    try:
+        with open(src, "rb") as fsrc, open(dst, "xb") as fdst:
+            try:
+                ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            except OSError:
+                fdst.close()
+                os.unlink(dst)
+
+                return False
+    except OSError:
+        return False
+
+    shutil.copymode(src, dst)
+
+    return True
+
+
+def _restore_file(backup: SPathLike, original: SPathLike) -> None:
+    """Put a backup made by `_link_or_copy` back in place, but only if the original is gone."""
+    # Linking fails if the original still exists, which saves checking for it first.
+    try:
+        os.link(backup, original)
+    except FileExistsError:
+        pass
+    except OSError:
+        if not os.path.exists(original):
+            os.replace(backup, original)
+
+
+@lru_cache(maxsize=1)
+def _get_executor() -> ThreadPoolExecutor:
+    """
+    Get the thread pool shared by short, disk- or subprocess-bound jobs, so repeated calls don't keep spawning threads.
+
+    Jobs submitted to this pool must not wait on other jobs in it.
+    """
+    return ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix="audio-io")
+
+
+@stat_cache(maxsize=512)
+def _probe_is_audio(path: str) -> bool:
+    """Only run a full probe if the magic bytes are inconclusive."""
+    if _sniff_audio(path):
+        return True
+
+    try:
+        FileType.AUDIO.parse(path, func=_probe_is_audio)
+    except (AssertionError, ValueError):
+        return False
+
+    return True
+
+
+@stat_cache(maxsize=512)
+def _probe_is_video(path: str) -> bool:
+    try:
+        FileType.VIDEO.parse(path, func=_probe_is_video)
+    except (AssertionError, ValueError):
+        return False
+
+    return True
+
+
+def _is_lossy(track: Any) -> bool:
+    """Whether an already parsed MediaInfo track is lossy, going by muxtools' format table first."""
+    if (form := format_from_track(track)) is not None:
+        return form.lossy
+
+    # "Lossless / Lossy" (DTS-HD MA, TrueHD with an AC-3 core) is lossless, so this has to be an exact match.
+    return str(getattr(track, "compression_mode", None) or "lossless").lower() == "lossy"
+
+
+def _load_probe_cache() -> dict[str, dict[str, Any]]:
+    try:
+        with open(_as_spath(get_workdir()) / _PROBE_CACHE_NAME, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    return cache if isinstance(cache, dict) else {}
+
+
+def _save_probe_cache(cache: dict[str, dict[str, Any]]) -> None:
+    # Without a writable workdir, everything simply gets probed again next time.
+    try:
+        (workdir := _as_spath(get_workdir())).mkdir(parents=True, exist_ok=True)
+
+        with open(workdir / _PROBE_CACHE_NAME, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+    except OSError:
+        pass
+
+
+def _prefetch_mediainfo(paths: Iterable[Any]) -> None:
+    """Warm the MediaInfo cache for multiple files at once. Parsing is mostly spent waiting on disk reads."""
+    files = [p for p in paths if isinstance(p, (str, os.PathLike))]
+
+    if len(files) < 2:
+        return
+
+    def _probe(path: SPathLike) -> None:
+        try:
+            get_mediainfo(path)
+        except Exception:
+            # Any real problem will be raised again by the caller once it parses the file itself.
+            pass
+
+    list(_get_executor().map(_probe, files))
+
+
 class _AudioEncoder(_BaseEncoder):
     """Class containing methods pertaining to handling audio encoding."""
 
-    audio_files: list[SPath] = []
-    """A list of all audio source files."""
+    audio_files: list[SPath | AudioFile]
+    """A list of all audio source files, or the audio extracted from the m2ts if no demuxed tracks were found."""
 
-    audio_tracks: list[AudioTrack] = []
+    audio_tracks: list[AudioTrack]
     """A list of all audio tracks."""
 
+    _audio_lock: Lock
+    """Guards the audio track list while `encode_audio_async` may be writing to it from another thread."""
+
+    _acopy_files: set[str]
+    """Paths of the acopy files made while encoding, which still have to be removed."""
+
     def find_audio_files(
         self, dgi_path: SPathLike | None = None,
         reorder: list[int] | Literal[False] = False,
-    ) -> list[SPath]:
+    ) -> list[SPath | AudioFile]:
         """
         Find accompanying DGIndex(NV) demuxed audio tracks.
 
@@ -40,81 +376,202 @@ class _AudioEncoder(_BaseEncoder):
             dgi_path = dgi_path[0]
 
         if dgi_path is not None:
-            dgi_file = SPath(dgi_path)
+            dgi_file = _as_spath(dgi_path)
         else:
             dgi_file = self.script_info.src_file[0]
 
-        # Pre-clean acopy files because it's a pain if you ran this after updating...
-        self.__clean_acopy(dgi_file)
-
-        if not dgi_file.to_str().endswith(".dgi"):
+        if dgi_file.suffix.lower() != ".dgi":
             Log.debug("Trying to pass a non-dgi file! Figuring out an audio source...", self.find_audio_files)
 
-            try:
-                FileType.AUDIO.parse(dgi_file, func=self.find_audio_files)
-                audio_files = [dgi_file]
-            except (AssertionError, ValueError):
-                pass
+            # Pre-clean acopy files because it's a pain if you ran this after updating...
+            self.__clean_acopy(dgi_file)
 
-            try:
-                FileType.VIDEO.parse(dgi_file, func=self.find_audio_files)
+            audio_files: list[SPath] = []
 
-                audio_files = [SPath(FFMpeg().Extractor().extract_audio(dgi_file).file)]  # type;ignore
-            except (AssertionError, ValueError):
-                pass
+            # Plain audio files don't need the (much more expensive) video probe and extraction at all.
+            if self._is_audio_file(dgi_file):
+                audio_files = [dgi_file]
+            elif self._is_video_file(dgi_file):
+                audio_files = [_as_spath(self._extract_audio_once(dgi_file).file)]
         else:
             Log.debug("DGIndex(NV) input found! Trying to find audio tracks...", self.find_audio_files)
 
             audio_files: list[SPath] = []  # type:ignore[no-redef]
 
-            # [] and () characters mess up the glob, so replacing them
-            search_string = f'*{dgi_file.stem}*.*'.translate(str.maketrans('[]()', '????')).replace('**', '*')
+            candidates: list[SPath] = []
+            acopies: list[str] = []
+            folder = dgi_file.get_folder()
+            stem = dgi_file.stem.lower()
+            stem_len = len(stem)
 
-            for f in dgi_file.get_folder().glob(search_string):
-                # explicitly ignore certain files; audio.parse seems to count these for some reason?
-                if f.suffix.lower() in (".log", ".sup", ".ttf", ".otf", ".ttc", ".wob"):
-                    continue
+            # Acopy leftovers are picked up in the same pass, rather than listing the directory again to clean them.
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    name = entry.name.lower()
 
-                Log.debug(f"Checking the following file: \"{f.name}\"...", self.find_audio_files)
+                    if _is_acopy(name):
+                        acopies += [entry.path]
 
-                try:
-                    FileType.AUDIO.parse(f, func=self.find_audio_files)
-                except (AssertionError, ValueError) as e:
-                    print(e)
-                    continue
+                        continue
+
+                    # Same as globbing `*{stem}*.*`, but [] and () in the stem don't need escaping.
+                    if (idx := name.find(stem)) < 0 or "." not in name[idx + stem_len:]:
+                        continue
+
+                    # explicitly ignore certain files; audio.parse seems to count these for some reason?
+                    if os.path.splitext(name)[1] in _SKIP_SUFFIXES or not entry.is_file():
+                        continue
+
+                    candidates += [SPath(entry.path)]
+
+            self.__clean_acopy(dgi_file, acopies)
 
-                audio_files += [f]
+            is_debug = Log.is_debug
+
+            # Demuxes with a well-known audio extension don't have to be opened at all.
+            to_probe = [f for f in candidates if f.suffix.lower() not in _AUDIO_SUFFIXES]
+
+            # Everything else gets sniffed and, if that's inconclusive, fully probed (mostly spent waiting on the disk).
+            checked = self._probe_audio_candidates(to_probe)
+
+            for f in candidates:
+                if is_debug:
+                    Log.debug(f"Checking the following file: \"{f.name}\"...", self.find_audio_files)
+
+                if checked.get(f, True):
+                    audio_files += [f]
+
+            if not audio_files:
+                audio_files = self._find_m2ts_audio(dgi_file)  # type:ignore[assignment]
 
         if not audio_files:
             return []
 
-        Log.info(f"The following audio sources were found ({len(audio_files)}):")
-
-        audio_files = sorted(audio_files, key=self.extract_pid)
+        # Audio extracted from the m2ts comes back as AudioFile objects, which are sorted by their path.
+        audio_files.sort(key=lambda f: self.extract_pid(getattr(f, "file", f)))
 
         if reorder:
             old, new = audio_files, self._reorder(audio_files, reorder)
             Log.info(f"Reordering files! {old=}, {new=}", self.find_audio_files)
             audio_files = new
 
+        # Log the whole list in one go rather than one call per file.
+        found = [f"The following audio sources were found ({len(audio_files)}):"]
+
         for f in audio_files:
             try:
-                Log.info(f"    - \"{f.name if isinstance(f, SPath) else f.file}\"")  # type:ignore[attr-defined]
+                found += [f"    - \"{f.name if isinstance(f, SPath) else f.file}\""]  # type:ignore[attr-defined]
             except (AttributeError, ValueError) as e:
                 Log.warn(f"    - Unknown track!\n{e}")
 
+        Log.info("\n".join(found))
+
         self.audio_files += audio_files
 
         return audio_files
 
-    def _find_m2ts_audio(self, dgi_file: SPath) -> list[SPath]:
-        from vsmuxtools import parse_m2ts_path
+    def _is_audio_file(self, file: SPathLike) -> bool:
+        """Check whether a file is an audio file, reusing the previous result for as long as the file is unchanged."""
+        try:
+            return _probe_is_audio(file)
+        except OSError:
+            return False
 
+    def _is_video_file(self, file: SPathLike) -> bool:
+        """Check whether a file is a video file, reusing the previous result for as long as the file is unchanged."""
+        try:
+            return _probe_is_video(file)
+        except OSError:
+            return False
+
+    def _probe_audio_candidates(self, files: list[SPath]) -> dict[SPath, bool]:
+        """
+        Check which files are audio files, remembering the results in a cache file inside the workdir.
+        Nothing is written next to the sources, which may be read-only or shared.
+
+        Re-running on the same source (e.g. while tweaking the filterchain) then only has to stat the files.
+        """
+        if not files:
+            return {}
+
+        cache = _load_probe_cache()
+        checked = dict[SPath, bool]()
+        stats = dict[SPath, os.stat_result]()
+
+        for f in files:
+            try:
+                st = stats[f] = os.stat(f)
+            except OSError:
+                checked[f] = False
+                continue
+
+            # Only trust results for files that haven't changed since they were probed.
+            if not isinstance(entry := cache.get(os.path.abspath(f)), dict):
+                continue
+
+            if entry.get("mtime") == st.st_mtime_ns and entry.get("size") == st.st_size:
+                checked[f] = bool(entry.get("is_audio"))
+
+        if not (to_probe := [f for f in stats if f not in checked]):
+            return checked
+
+        for f, is_audio in zip(to_probe, _get_executor().map(self._is_audio_file, to_probe)):
+            checked[f] = is_audio
+            cache[os.path.abspath(f)] = dict(mtime=stats[f].st_mtime_ns, size=stats[f].st_size, is_audio=is_audio)
+
+        _save_probe_cache(cache)
+
+        return checked
+
+    def _extract_audio_once(self, video_file: SPath) -> AudioFile:
+        """Extract the audio from a video file, reusing an earlier extraction of the same file."""
+        self._extracted_audio: dict[str, AudioFile] = getattr(self, "_extracted_audio", {})
+
+        key = video_file.resolve().to_str()
+
+        if (extracted := self._extracted_audio.get(key)) is None or not _as_spath(extracted.file).exists():
+            extracted = self._extracted_audio[key] = FFMpeg.Extractor().extract_audio(video_file)
+
+        return extracted
+
+    def _demux_containers(self, files: list[SPath | AudioFile]) -> list[SPath | AudioFile]:
+        """
+        Replace video containers with their extracted audio.
+
+        Every later step (probing, trimming, encoding) then only has to read a small audio-only file,
+        rather than the entire container every time. The extracted files keep the container's delay.
+        """
+        self._extracted_audio = getattr(self, "_extracted_audio", {})
+
+        # Files extracted earlier (e.g. by `find_audio_files`) are matched back up with their delay.
+        extracted = {os.fspath(afile.file): afile for afile in self._extracted_audio.values()}
+
+        def _demux(file: SPath | AudioFile) -> SPath | AudioFile:
+            if isinstance(file, AudioFile):
+                return file
+
+            if (afile := extracted.get(os.fspath(file))) is not None:
+                return afile
+
+            if self._is_audio_file(file) or not self._is_video_file(file):
+                return file
+
+            return self._extract_audio_once(file)
+
+        return list(_get_executor().map(_demux, files))
+
+    def _find_m2ts_audio(self, dgi_file: SPath) -> list[AudioFile]:
         Log.debug("No audio tracks could be found! Trying to find the source file...", self.find_audio_files)
 
-        m2ts = parse_m2ts_path(dgi_file)
+        # Only DGIndexNV files point back to an m2ts, so don't bother parsing anything else.
+        if (dgi_file := _as_spath(dgi_file)).suffix.lower() != ".dgi" or not dgi_file.is_file():
+            Log.debug("No m2ts file found! Not encoding any audio...", self.find_audio_files)
+
+            return []
 
-        if str(m2ts).endswith('.dgi'):
+        m2ts = _get_m2ts_path(dgi_file)
+
+        if m2ts.suffix.lower() == ".dgi":
             Log.debug("No m2ts file found! Not encoding any audio...", self.find_audio_files)
 
             return []
@@ -123,11 +580,9 @@ class _AudioEncoder(_BaseEncoder):
 
         return self._extract_tracks(m2ts)
 
-    def _extract_tracks(self, video_file: SPath) -> list[SPath]:
+    def _extract_tracks(self, video_file: SPath) -> list[AudioFile]:
         """Extract tracks if a video file is passed."""
-        from pymediainfo import MediaInfo, Track  # type:ignore[import]
-
-        video_file = SPath(video_file)
+        video_file = _as_spath(video_file)
 
         if not video_file.exists():
             Log.error(
@@ -135,23 +590,84 @@ class _AudioEncoder(_BaseEncoder):
                 FileNotExistsError, reason=video_file.to_str()  # type:ignore[arg-type]
             )
 
-        mi = MediaInfo.parse(video_file)
+        # MediaInfo numbers the audio streams the same way ffmpeg's `0:a:N` and muxtools' extractor do.
+        # Track exposes every parsed field as an attribute (None if missing), so there's no need to build `to_data()`.
+        tracks = {
+            i if (sid := getattr(track, "stream_identifier", None)) is None else int(sid): track
+            for i, track in enumerate(get_mediainfo(video_file).audio_tracks)
+        }
+
+        extracted = self._extract_copies(video_file, tracks)
+
+        # Lossless tracks may have a padded bitdepth, which muxtools' extractor checks for and handles.
+        # Every track gets written to its own `_extracted_{track}` file, so these can safely run side by side.
+        rest = [sid for sid in tracks if sid not in extracted]
+
+        extracted |= zip(rest, _get_executor().map(lambda sid: FFMpeg.Extractor(sid).extract_audio(video_file), rest))
 
-        atracks = list[AudioTrack]()
-        _track = -1
+        return [extracted[sid] for sid in tracks]
 
-        for track in mi.tracks:
-            assert isinstance(track, Track)
+    def _extract_copies(self, video_file: SPath, tracks: dict[int, Any]) -> dict[int, AudioFile]:
+        """
+        Extract every track muxtools would simply stream-copy with a single ffmpeg call,
+        so the source only has to be read once. Earlier extractions are reused if the source hasn't changed since.
+
+        Takes and returns tracks by their stream identifier. Tracks that could not be extracted are left out.
+        """
+        if not (ffmpeg := shutil.which("ffmpeg")):
+            return {}
+
+        workdir = _as_spath(get_workdir())
+        workdir.mkdir(parents=True, exist_ok=True)
+
+        src_mtime = os.stat(video_file).st_mtime_ns
+
+        args = [ffmpeg, "-hide_banner", "-v", "error", "-y", "-i", video_file.to_str()]
+        outputs = dict[int, tuple[SPath, int]]()
+        stale = dict[int, SPath]()
+
+        for i, track in tracks.items():
+            # Same as muxtools' extractor: only lossy and Atmos/DTS:X tracks are copied without any analysis.
+            if (form := format_from_track(track)) is None or not (form.lossy or is_fancy_codec(track)):
+                continue
+
+            out = workdir / f"{video_file.stem}_extracted_{i}.{form.ext}"
+
+            outputs[i] = (out, getattr(track, "delay_relative_to_video", 0) or 0)
 
-            if track.track_type == 'Audio':
-                _track += 1
+            # Outputs only ever appear once ffmpeg finished writing them, so an existing one is always complete.
+            try:
+                if os.stat(out).st_mtime_ns >= src_mtime:
+                    continue
+            except OSError:
+                pass
+
+            stale[i] = out.with_name(f"{out.stem}.part{out.suffix}")
+            args += ["-map_chapters", "-1", "-map", f"0:a:{i}", "-c:a", "copy"]
+
+            # ffmpeg doesn't know dtshd as an output format, but writes it just fine as dts.
+            if form.ext in ("dts", "dtshd"):
+                args += ["-f", "dts"]
 
-                atracks += [
-                    FFMpeg.Extractor(_track if track is None else int(track.to_data().get("stream_identifier", _track)))
-                    .extract_audio(video_file)
-                ]
+            args += [stale[i].to_str()]
+
+        if stale:
+            Log.info(f"Extracting {len(stale)} audio track(s) from \"{video_file.name}\"...", self._extract_tracks)
+
+            if subprocess.run(args).returncode:
+                for i, part in stale.items():
+                    part.unlink(missing_ok=True)
+                    del outputs[i]
+
+                Log.warn(
+                    "Could not extract every audio track in one go! Extracting them one by one instead...",
+                    self._extract_tracks
+                )
+            else:
+                for i, part in stale.items():
+                    os.replace(part, outputs[i][0])
 
-        return atracks
+        return {i: AudioFile(out, delay, video_file) for i, (out, delay) in outputs.items()}
 
     def encode_audio(
         self,
@@ -164,6 +680,8 @@ class _AudioEncoder(_BaseEncoder):
         trimmer: HasTrimmer | None | Literal[False] = None,
         force: bool = False,
         verbose: bool = False,
+        jobs: int = 1,
+        check_dupes: bool | Literal["decoded", "acoustic"] = False,
     ) -> list[AudioTrack]:
         """
         Encode the audio tracks.
@@ -171,6 +689,8 @@ class _AudioEncoder(_BaseEncoder):
         :param audio_file:      Path to an audio file or an AudioNode. If none, checks object's audio files.
         :param trims:           Audio trims. If False or empty list, do not trim.
                                 If True, use trims passed in ScriptInfo.
+                                A None start or end trims from the start or up to the end of the clip.
+                                A negative end counts back from the end of the clip, like in muxtools.
         :param reorder:         Reorder tracks. For example, if you know you have 3 audio tracks
                                 ordered like [JP, EN, "Commentary"], you can pass [1, 0, 2]
                                 to reorder them to [EN, JP, Commentary].
@@ -181,25 +701,70 @@ class _AudioEncoder(_BaseEncoder):
                                 where one set of kwargs goes to every track.
         :param encoder:         Audio encoder to use. If the audio file is lossy, it will NEVER re-encode it!
                                 Default: AutoEncoder (default arguments).
-        :param trimmer:         Trimmer to use for trimming. If False, don't trim at all.
-                                If None, automatically determine the trimmer based on input file.
+        :param trimmer:         Trimmer to use for trimming, e.g. Sox or FFMpeg.Trimmer (a class or an instance),
+                                or FFMpeg for its trimmer. If False, don't trim at all.
+                                If None, muxtools picks FFMpeg for lossy and Sox for lossless input.
         :param verbose:         Enable more verbose output.
         :param force:           Force the audio files to be re-encoded, even if they're lossy.
                                 I'm aware I said it would never re-encode it.
+        :param jobs:            How many tracks to process at the same time. If 0 or lower, use one per CPU core.
+                                Default: 1.
+                                Muxtools writes intermediate FLAC files for some encoders and trimmers
+                                (e.g. FLAC, or Sox on non-PCM input) to the same temp file,
+                                so only raise this if none of your tracks go through that.
+        :param check_dupes:     Drop encoded tracks that duplicate an earlier track from this call.
+                                If True, only drop bit-identical files.
+                                If "decoded", also drop tracks with identical decoded audio (requires ffmpeg).
+                                If "acoustic", also drop re-encodes of the same audio (requires fpcalc).
+                                Note that this also matches downmixes of the same audio.
+                                Default: False.
+
+        :raises CustomValueError:   An end trim lies before its start trim, e.g. (100, 50).
         """
-        from itertools import zip_longest
+        atracks = list(self.iter_encode_audio(
+            audio_file, trims, reorder, ref, track_args, encoder, trimmer, force, verbose, jobs
+        ))
 
-        from vsmuxtools import (FLAC, Sox, do_audio, frames_to_samples,
-                                is_fancy_codec)
+        if check_dupes and len(atracks) > 1:
+            kept = self._check_dupe_audio(
+                atracks, decoded=check_dupes in ("decoded", "acoustic"), acoustic=check_dupes == "acoustic"
+            )
+
+            dropped = {id(atrack) for atrack in atracks} - {id(atrack) for atrack in kept}
+
+            with self._audio_lock:
+                self.audio_tracks = [atrack for atrack in self.audio_tracks if id(atrack) not in dropped]
 
-        from ..script import ScriptInfo
+        return self.audio_tracks if atracks else []
+
+    def iter_encode_audio(
+        self,
+        audio_file: SPath | list[SPath] | vs.AudioNode | None = None,
+        trims: list[tuple[int, int]] | tuple[int, int] | None = None,
+        reorder: list[int] | Literal[False] = False,
+        ref: vs.VideoNode | Any | None = None,
+        track_args: list[dict[str, Any]] = [dict(lang="ja", default=True)],
+        encoder: Encoder = AutoEncoder,
+        trimmer: HasTrimmer | None | Literal[False] = None,
+        force: bool = False,
+        verbose: bool = False,
+        jobs: int = 1,
+    ) -> Iterator[AudioTrack]:
+        """
+        Encode the audio tracks, yielding every track as soon as it's done.
 
+        Takes the same arguments as `encode_audio`. Every track is also added to `audio_tracks`
+        as it's yielded, so callers can start working with the first tracks before the rest are encoded.
+        """
         func = self.encode_audio
 
+        # Read the logger level once; the loop below would otherwise query it on every track.
+        is_debug = Log.is_debug
+
         if all(not afile for afile in (audio_file, self.audio_files)):
             Log.warn("No audio tracks found to encode...", func)
 
-            return []
+            return
 
         is_file = True
 
@@ -207,9 +772,12 @@ class _AudioEncoder(_BaseEncoder):
             if isinstance(audio_file, vs.AudioNode):
                 audio_file = [audio_file]  # type:ignore[list-item]
             elif not isinstance(audio_file, list):
-                audio_file = [SPath(str(audio_file))]
+                audio_file = [_as_spath(audio_file)]
+            else:
+                # Paths are only converted once here, rather than every time a track's path gets used.
+                audio_file = [_as_spath(f) if isinstance(f, (str, os.PathLike)) else f for f in audio_file]
 
-        if any([isinstance(audio_file, vs.AudioNode)]):
+        if isinstance(audio_file, list) and any(isinstance(f, vs.AudioNode) for f in audio_file):
             is_file = False
             Log.warn("AudioNode passed! This may be a buggy experience...", func)
 
@@ -219,10 +787,17 @@ class _AudioEncoder(_BaseEncoder):
         if is_file:
             self.__clean_acopy(process_files[0])  # type:ignore[index]
 
-        if ref is not None:
+        if ref is not None and is_debug:
             Log.debug(f"`ref` VideoNode passed: {ref}", func)
 
-        wclip = ref.src.init() if isinstance(ref, ScriptInfo) else ref or self.script_info.src.init()
+        # The source is only indexed once, and reused as the reference clip if none was passed.
+        src = cast(vs.VideoNode, self.script_info.src.init())
+
+        wclip = ref.src.init() if isinstance(ref, ScriptInfo) else ref or src
+
+        # VideoNode.fps builds a new Fraction on every access, so only read these once.
+        fps, num_frames = wclip.fps, wclip.num_frames
+        src_fps, src_num_frames = (fps, num_frames) if wclip is src else (src.fps, src.num_frames)
 
         trims = self.script_info.trim if trims is None else trims
 
@@ -235,246 +810,347 @@ class _AudioEncoder(_BaseEncoder):
             trims = [trims] if not isinstance(trims[0], tuple) else trims
         else:
             trims_list = trims if isinstance(trims[0], tuple) else [trims]
-            trims = [frames_to_samples(x, 48000, wclip.fps) for x in trims_list]
+            trims = [frames_to_samples(x, 48000, fps) for x in trims_list]
 
-        if trims:
+        if trims and is_debug:
             Log.debug(f"{trims=}", func)
 
         process_files = self._reorder(process_files, reorder)
 
         if not process_files:
-            return process_files
+            return
+
+        if is_file:
+            process_files = self._demux_containers(process_files)  # type:ignore[arg-type]
+
+            _prefetch_mediainfo(getattr(f, "file", f) for f in process_files)
 
         # Normalising track args
         if track_args and not isinstance(track_args, list):
             track_args = [track_args]
 
-        # codec = self._get_audio_codec(encoder)
         encoder = encoder() if callable(encoder) else encoder
 
-        trimmer_kwargs = dict(
-            fps=wclip.fps,
-            num_frames=wclip.num_frames
-        )
+        # Muxtools' temp dir is shared by every track, so clear out leftovers once before any work starts.
+        if is_file:
+            shutil.rmtree(_as_spath(get_workdir()) / ".temp", True)
+
+        self._acopy_files = getattr(self, "_acopy_files", set())
+
+        # The workdir only has to be listed once, rather than once per track.
+        trimmed_files = self._get_trimmed_files() if is_file else []
+
+        # Tracks without their own trims or track args reuse the last ones given.
+        trims, track_args = trims or [], track_args or []  # type:ignore[assignment]
+        last_trim, last_arg = trims[-1] if trims else None, track_args[-1] if track_args else {}
+
+        tasks = [
+            (i, (
+                audio_file,
+                trims[i] if i < len(trims) else last_trim,  # type:ignore[index, arg-type]
+                track_args[i] if i < len(track_args) else last_arg
+            ))
+            for i, audio_file in enumerate(process_files)
+        ]
+
+        def _encode(task: tuple[int, tuple[Any, Any, Any]]) -> AudioTrack:
+            i, (audio_file, trim, track_arg) = task
+
+            # Every track gets its own encoder, so per-track changes don't leak into other tracks.
+            return self._encode_track(
+                i, audio_file, trim, track_arg, copy(encoder), trimmer,
+                force=force, verbose=verbose, fps=fps, num_frames=num_frames,
+                src_fps=src_fps, src_num_frames=src_num_frames,
+                trimmed_files=trimmed_files, total=len(tasks), is_debug=is_debug
+            )
 
-        # TODO: Figure out how much I can move out of this for loop.
-        for i, (audio_file, trim, track_arg) in enumerate(  # type:ignore[arg-type, assignment]
-            zip_longest(process_files, trims, track_args, fillvalue=trims[-1])  # type:ignore[arg-type]
-        ):
-            if not isinstance(trim, tuple):
-                Log.warn(f"Trim is not a tuple: {trim} ({type(trim)})", self.encode_audio)
-                trim = tuple(trim)
+        def _encode_buffered(task: tuple[int, tuple[Any, Any, Any]]) -> AudioTrack:
+            # Keep every track's log output together, rather than interleaving it with the other tracks.
+            with Log.buffered():
+                return _encode(task)
 
-            # I guess this is something to worry about now?
-            if trim == track_arg:
-                track_arg = track_args[-1]
+        if jobs <= 0:
+            jobs = os.cpu_count() or 1
 
-            if any(x < 0 for x in trim):
-                old_trim, trim = trim, tuple(max(0, x) for x in trim)
-                Log.warn(
-                    f"Negative trim values set to 0: {trim}. Original trim: {old_trim}",
-                    self.encode_audio
-                )
+        try:
+            if jobs > 1 and len(tasks) > 1:
+                with ThreadPoolExecutor(max_workers=min(jobs, len(tasks))) as executor:
+                    yield from self.__collect_tracks(executor.map(_encode_buffered, tasks))
+            else:
+                yield from self.__collect_tracks(map(_encode, tasks))
+        finally:
+            # Remove the acopy files made during this encode again so they don't mess up future encodes.
+            self.__remove_acopies()
+
+    def __collect_tracks(self, atracks: Iterable[AudioTrack]) -> Iterator[AudioTrack]:
+        for atrack in atracks:
+            with self._audio_lock:
+                self.audio_tracks += [atrack]
+
+            yield atrack
+
+    def encode_audio_async(self, *args: Any, **kwargs: Any) -> Future[list[AudioTrack]]:
+        """
+        Run `encode_audio` in a background thread, so audio can be encoded while the video is encoding.
 
-            if any(x > wclip.num_frames for x in trim):
-                old_trim, trim = trim, tuple(min(wclip.num_frames, x) for x in trim)
-                Log.warn(
-                    f"Trim values greater than the number of frames set to the number of frames: {trim}. "
-                    f"Original trim: {old_trim}", self.encode_audio
-                )
+        Takes the same arguments as `encode_audio`. Muxing waits for the audio to finish on its own,
+        but you can also call `result()` on the returned future to wait for it yourself.
+        """
+        if (executor := getattr(self, "_audio_executor", None)) is None:
+            executor = self._audio_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audio-encode")
 
-            if track_arg:
-                track_arg = dict(track_arg)
+        self._audio_future: Future[list[AudioTrack]] = executor.submit(self.encode_audio, *args, **kwargs)
 
-            delay = track_arg.pop("delay", 0)
+        return self._audio_future
 
-            Log.debug(
-                f"Processing audio track {i + 1}/{len(process_files)}...",  self.encode_audio  # type:ignore[arg-type]
-            )
-            Log.debug(f"Processing audio file \"{audio_file}\"...", func)
-            Log.info(f"{trim=}, {track_arg=}", func)
+    def _wait_for_audio(self) -> None:
+        """Wait for an audio encode started with `encode_audio_async` to finish, re-raising any errors."""
+        if (future := getattr(self, "_audio_future", None)) is not None:
+            future.result()
 
-            if delay:
-                Log.info(f"Delay passed ({delay}ms), applying to source audio file...", func)
+    def _encode_track(
+        self, i: int, audio_file: SPath | AudioFile | vs.AudioNode, trim: Any, track_arg: dict[str, Any],
+        encoder: Encoder | None, trimmer: HasTrimmer | None | Literal[False],
+        force: bool, verbose: bool, fps: Any, num_frames: int, src_fps: Any, src_num_frames: int,
+        trimmed_files: list[SPath], total: int, is_debug: bool
+    ) -> AudioTrack:
+        """Trim and encode a single audio track. Called once per track by `encode_audio`."""
+        func = self.encode_audio
 
-            src = cast(vs.VideoNode, self.script_info.src.init())
+        if trim is not None and not isinstance(trim, tuple):
+            Log.warn(f"Trim is not a tuple: {trim} ({type(trim)})", self.encode_audio)
+            trim = tuple(trim)
 
-            # This is mainly meant to support weird trims we don't typically support and should not be used otherwise!
-            if isinstance(audio_file, vs.AudioNode):
-                Log.warn(
-                    "Not properly supported yet! This may fail!", self.encode_audio,
-                    CustomNotImplementedError
-                )  # type:ignore[arg-type]
+        track_arg = dict(track_arg)
 
-                atrack = do_audio(
-                    audio_file, encoder=encoder, fps=src.fps, num_frames=src.num_frames
-                )
+        delay = track_arg.pop("delay", 0)
 
-                atrack.container_delay = delay
+        if is_debug:
+            Log.debug(f"Processing audio track {i + 1}/{total}...", func)
+            Log.debug(f"Processing audio file \"{audio_file}\"...", func)
+        Log.info(f"{trim=}, {track_arg=}", func)
 
-                self.audio_tracks += [atrack.to_track(**track_arg)]
+        if delay:
+            Log.info(f"Delay passed ({delay}ms), applying to source audio file...", func)
 
-                continue
+        # This is mainly meant to support weird trims we don't typically support and should not be used otherwise!
+        if isinstance(audio_file, vs.AudioNode):
+            Log.warn(
+                "Not properly supported yet! This may fail!", self.encode_audio,
+                CustomNotImplementedError
+            )  # type:ignore[arg-type]
+
+            atrack = do_audio(audio_file, encoder=encoder, fps=src_fps, num_frames=src_num_frames)
 
-            trimmed_files = list(SPath(get_workdir()).glob(f"{audio_file.stem}_*_trimmed_*.*"))
+            atrack.container_delay = delay
 
-            if trimmed_files:
-                # Delete temp dir to minimise random errors.
-                if trimmed_files[0].exists():
-                    shutil.rmtree(trimmed_files[0].parent / ".temp", True)
+            return atrack.to_track(**track_arg)
 
-                # If a trimmed audio file already exists, this means it was likely already encoded.
-                if trim:
-                    Log.debug(f"Trimmed file found at \"{trimmed_files[0]}\"! Skipping encoding...", func)
+        # Audio extracted from a container keeps that container's delay, on top of any delay passed.
+        if isinstance(audio_file, AudioFile):
+            source, delay = audio_file.source, delay + (audio_file.container_delay or 0)
+            audio_file = _as_spath(audio_file.file)
+        else:
+            source = audio_file
 
-                    afile = AudioFile.from_file(trimmed_files[0], func)
-                    afile.container_delay = delay
+        if trim:
+            trim, trim_delay = self._resolve_trim(trim, num_frames, fps)
+            delay -= trim_delay
 
-                    self.audio_tracks += [afile.to_track(**(track_arg | dict(default=not bool(i))))]
+        # Anything that changes the output has to be part of the key, so stale trimmed files aren't reused.
+        cache_key = _trim_cache_key(
+            audio_file, audio_file.name, trim, delay, force, str(src_fps), src_num_frames,
+            _settings_key(encoder), _settings_key(trimmer)
+        ) if trim else None
 
-                    continue
+        # If a trimmed audio file made from the same inputs already exists, it was already encoded.
+        if cache_key and (trimmed_file := self._find_trimmed_file(audio_file, trimmed_files, cache_key)) is not None:
+            if is_debug:
+                Log.debug(f"Trimmed file found at \"{trimmed_file}\"! Skipping encoding...", func)
 
-            afile = AudioFile.from_file(audio_file, func)
-            afile.container_delay = delay
+            return AudioFile(trimmed_file, delay, source).to_track(**(track_arg | dict(default=not bool(i))))
 
-            afile_copy = afile.file.with_suffix(".acopy")
-            afile_old = afile.file
+        afile = AudioFile(audio_file, delay, source)
 
-            try:
-                FileType.AUDIO.parse(afile_old, func=self.encode_audio)
-                is_audio_file = True
-            except (AssertionError, ValueError):
-                is_audio_file = False
+        # Keyed on the full file name and the track, so tracks sharing a source or a stem never share a copy.
+        afile_copy = afile.file.with_name(f"{afile.file.name}.acopy.{i}")
+        afile_old = afile.file
+
+        is_audio_file = self._is_audio_file(afile_old)
 
-            # vsmuxtools, at the time of writing, deletes the original audio files if you pass an external file.
-            if is_audio_file and not afile_copy.exists():
+        # vsmuxtools, at the time of writing, deletes the original audio files if you pass an external file.
+        if is_audio_file:
+            if is_debug:
                 Log.debug(
                     f"Copying audio file \"{afile.file.name}\" "
                     "(this is a temporary workaround)!", self.encode_audio
                 )
 
-                afile_copy = shutil.copy(afile.file, afile_copy)
+            _link_or_copy(afile.file, afile_copy)
 
-            try:
-                is_lossy = force or afile.is_lossy()
-            except IndexError:
-                raise Log.error(f"Could not get the mediainfo for \"{afile.file}\"!", CustomIndexError)
-
-            # Trim the audio file if applicable.
-            if trim and trimmer is not False:
-                trimmer_obj = trimmer or (FFMpeg.Trimmer if is_lossy else Sox)
-                trimmer_obj = trimmer_obj(**trimmer_kwargs)
-
-                if any(x is None for x in trim):
-                    trim = (trim[0] or 0, trim[1] or wclip.num_frames)
-
-                if trim[0] < 0:
-                    new_delay = frame_to_ms(abs(trim[0]), wclip.fps)
-
-                    Log.warn(
-                        f"Start trim value is negative ({trim[0]})! Calculating additional delay of {new_delay}ms!",
-                        self.encode_audio
-                    )
-
-                    delay -= new_delay
-                    trim = (0, trim[1])
-
-                if trim[1] > wclip.num_frames:
-                    trim = (trim[0], wclip.num_frames)
-                elif trim[1] < 0:
-                    trim_into_ep = wclip.num_frames - abs(trim[1])
-                    if trim_into_ep < 0:
-                        Log.warn(
-                            f"End trim is before the start trim ({trim[1]} < {trim[0]} ({trim_into_ep} frames))!",
-                            self.encode_audio
-                        )
-
-                        trim = (0, 0)
-                    else:
-                        trim = (trim[0], trim_into_ep)
-
-                setattr(trimmer_obj, "trim", trim)
-                setattr(trimmer_obj, "fps", wclip.fps)
-                setattr(trimmer_obj, "num_frames", wclip.num_frames)
-
-                if force and is_lossy:
-                    Log.debug(
-                        "\"force\" is set to True and the file is lossy! Creating an intermediary file...",
-                        self.encode_audio
-                    )
-
-                    afile = FLAC(compression_level=0).encode_audio(afile)
-
-                Log.info(f"Trimming audio file \"{afile.file}\" with trims {trim}...", self.encode_audio)
-                # afile = trimmer_obj.trim_audio(afile)
-
-            # Unset the encoder if force=False and it's a specific kind of audio track.
-            if is_lossy and force:
-                Log.warn("Input audio is lossy, but \"force=True\"...", self.encode_audio, 1)
-            elif is_fancy_codec(afile.get_mediainfo()) and force:
-                Log.warn("Audio contain Atmos or special DTS features, but \"force=True\"...", self.encode_audio, 1)
-            elif is_lossy and not force:
-                Log.warn("Input audio is lossy. Not re-encoding...", self.encode_audio, 1)
-                encoder = None
-            elif is_fancy_codec(afile.get_mediainfo()) and not force:
-                Log.warn("Audio contain Atmos or special DTS features. Not re-encoding...", self.encode_audio, 1)
-                encoder = None
-
-            if encoder:
-                setattr(encoder, "output", None)
-                # encoded = do_audio(afile, i, trim, wclip.fps, wclip.num_frames, None, None, encoder, not verbose)
-                # ensure_path(afile.file, func).unlink(missing_ok=True)
-                # afile = encoded
-
-            # Move the acopy to the original position if muxtools Thanos snapped it.
-            if not SPath(afile_old).exists():
-                afile_copy.replace(afile_old)
-                afile_copy.unlink(missing_ok=True)
-
-            atrack = do_audio(
-                audio_file, encoder=encoder, trims=trim, fps=src.fps, num_frames=src.num_frames, quiet=not verbose
+            self._acopy_files.add(os.fspath(afile_copy))
+
+        try:
+            # Both checks share one cached MediaInfo parse, where `afile.is_lossy()` would parse the file again.
+            mi_track = get_mediainfo(afile.file).audio_tracks[0]
+            is_lossy, is_fancy = _is_lossy(mi_track), is_fancy_codec(mi_track)
+        except IndexError:
+            raise Log.error(f"Could not get the mediainfo for \"{afile.file}\"!", CustomIndexError)
+
+        # Trim the audio file if applicable.
+        if trim and trimmer is not False:
+            Log.info(f"Trimming audio file \"{afile.file}\" with trims {trim}...", self.encode_audio)
+
+        # Unset the encoder if force=False and it's a specific kind of audio track.
+        if is_lossy and force:
+            Log.warn("Input audio is lossy, but \"force=True\"...", self.encode_audio, 1)
+        elif is_fancy and force:
+            Log.warn("Audio contain Atmos or special DTS features, but \"force=True\"...", self.encode_audio, 1)
+        elif is_lossy:
+            Log.warn("Input audio is lossy. Not re-encoding...", self.encode_audio, 1)
+            encoder = None
+        elif is_fancy:
+            Log.warn("Audio contain Atmos or special DTS features. Not re-encoding...", self.encode_audio, 1)
+            encoder = None
+
+        # Any intermediate FLAC transcode happens inside muxtools, which always writes it to `.temp/tempflac`
+        # in the workdir, so tracks sharing a workdir can't safely be force-encoded concurrently.
+        if encoder:
+            setattr(encoder, "output", None)
+
+        # Put the acopy back in the original position if muxtools Thanos snapped it.
+        _restore_file(afile_copy, afile_old)
+
+        atrack = do_audio(
+            audio_file, encoder=encoder, trimmer=_make_trimmer(trimmer), trims=trim,
+            fps=src_fps, num_frames=src_num_frames, quiet=not verbose
+        )
+
+        atrack.container_delay = delay
+
+        # do_audio returns the exact file it wrote, so the key can't end up next to another track's file.
+        if cache_key:
+            trimmed_file = _as_spath(atrack.file)
+            trimmed_file.with_name(trimmed_file.name + _CACHE_KEY_SUFFIX).write_text(cache_key)
+
+        if abs(atrack.container_delay) > 1001:
+            Log.warn(
+                f"Container delay is greater than 1001ms ({atrack.container_delay}ms)! "
+                "This is likely to cause syncing issues! Consider trimming the audio file further.",
+                self.encode_audio
             )
 
-            atrack.container_delay = delay
+        atrack = atrack.to_track(**track_arg)
 
-            if abs(atrack.container_delay) > 1001:
-                Log.warn(
-                    f"Container delay is greater than 1001ms ({atrack.container_delay}ms)! "
-                    "This is likely to cause syncing issues! Consider trimming the audio file further.",
-                    self.encode_audio
-                )
+        if is_debug:
+            Log.debug(str(atrack.__dict__), func)
 
-            atrack = atrack.to_track(**track_arg)
+        return atrack
 
-            # atrack.delay = delay
+    def _get_trimmed_files(self) -> list[SPath]:
+        """Get every trimmed file muxtools previously wrote to the workdir."""
+        if not (workdir := _as_spath(get_workdir())).is_dir():
+            return []
+
+        with os.scandir(workdir) as entries:
+            return [
+                SPath(entry.path) for entry in entries
+                if "_trimmed_" in entry.name and not entry.name.endswith(_CACHE_KEY_SUFFIX)
+            ]
+
+    def _find_trimmed_file(self, audio_file: SPath, trimmed_files: list[SPath], cache_key: str) -> SPath | None:
+        """
+        Find the trimmed file made from the given audio file with the exact same settings,
+        out of those found by `_get_trimmed_files`.
+        """
+        # do_audio always names these `{stem}_extracted_0_trimmed_{encoder}.{ext}`, possibly with a number added.
+        prefix = f"{audio_file.stem}_extracted_0_trimmed_"
+
+        for file in trimmed_files:
+            if file.name.startswith(prefix) and _read_cache_key(file) == cache_key:
+                return file
+
+        return None
+
+    def _resolve_trim(
+        self, trim: tuple[int | None, int | None], num_frames: int, fps: Any
+    ) -> tuple[tuple[int, int], int]:
+        """
+        Resolve a trim against the reference clip in a single pass.
+
+        Open ends become the clip's boundaries and negative end trims count back from the end of the clip,
+        e.g. (24, -24) on a 1000 frame clip becomes (24, 976).
+        A negative start trim can't be trimmed, so it's turned into delay instead.
+        An end trim before the start trim is an error.
+        Returns the resolved trim and the delay (in whole ms) to subtract from the track's delay.
+        """
+        start, end = trim
+
+        start = 0 if start is None else start
+        end = num_frames if end is None else end + num_frames if end < 0 else end
+
+        delay = 0
+
+        if start < 0:
+            # mkvmerge only takes whole milliseconds for the container delay.
+            delay = round(frame_to_ms(-start, fps))
+
+            Log.warn(
+                f"Start trim value is negative ({start})! Calculating additional delay of {delay}ms!",
+                self.encode_audio
+            )
+
+            start = 0
+
+        if end < 0:
+            Log.warn(f"End trim is before the start of the clip ({trim})! Trimming to (0, 0)...", self.encode_audio)
 
-            Log.debug(atrack.__dict__, func)
+            return (0, 0), delay
 
-            self.audio_tracks += [atrack]
+        if end < start:
+            Log.error(f"End trim is before the start trim ({trim})!", self.encode_audio, CustomValueError)
 
-        # Remove acopy files again so they don't mess up future encodes.
-        self.__clean_acopy(afile.file)
+        resolved = (min(start, num_frames), min(end, num_frames))
+
+        if resolved != (start, end):
+            Log.warn(
+                f"Trim values outside of the clip's frame range (0-{num_frames}) were clamped: {resolved}. "
+                f"Original trim: {trim}", self.encode_audio
+            )
 
-        return self.audio_tracks
+        return resolved, delay
 
     def _reorder(
         self, process_files: list[SPath] | None = None,
         reorder: list[int] | Literal[False] = False
     ) -> list[SPath]:
-        if not reorder:
-            return
-
         process_files = process_files or self.audio_files
 
+        if not reorder:
+            return process_files
+
         if len(reorder) > len(process_files):  # type:ignore[arg-type]
             reorder = reorder[:len(process_files)]  # type:ignore[arg-type]
 
-        return [process_files[i] for i in reorder]
+        if max(reorder) >= len(process_files) or min(reorder) < -len(process_files):
+            Log.error(
+                f"Reorder indices {reorder} are out of range for {len(process_files)} audio track(s)!",
+                self._reorder, CustomIndexError  # type:ignore[arg-type]
+            )
+
+        # itemgetter returns a bare item rather than a tuple when given a single index.
+        if len(reorder) == 1:
+            return [process_files[reorder[0]]]  # type:ignore[index]
+
+        return list(itemgetter(*reorder)(process_files))
 
-    def __clean_acopy(self, base_path: SPathLike | AudioFile) -> None:
-        """Try to forcibly clean up acopy files so they no longer pollute other methods."""
-        from vsmuxtools import GlobSearch
+    def __clean_acopy(self, base_path: SPathLike | AudioFile, acopies: list[str] | None = None) -> None:
+        """
+        Try to forcibly clean up acopy files so they no longer pollute other methods.
 
+        Every directory only gets swept once. Copies made afterwards are tracked and removed by `__remove_acopies`.
+        If the caller already listed the directory, it can pass the acopy files it found to skip listing it again.
+        """
         if isinstance(base_path, AudioFile):
             file = base_path.file
 
@@ -485,21 +1161,45 @@ class _AudioEncoder(_BaseEncoder):
         else:
             file = base_path
 
+        self._cleaned_acopy_dirs: set[str] = getattr(self, "_cleaned_acopy_dirs", set())
+
+        if (parent := os.fspath(_as_spath(file).parent)) in self._cleaned_acopy_dirs:
+            return
+
         try:
-            for acopy in SPath(file).parent.glob("*.acopy"):
+            if acopies is None:
+                with os.scandir(parent) as it:
+                    acopies = [
+                        entry.path for entry in it
+                        if _is_acopy(entry.name) and entry.is_file(follow_symlinks=False)
+                    ]
+
+            for acopy in acopies:
                 Log.debug(f"Unlinking file \"{acopy}\"...", self.encode_audio)
-                SPath(acopy).unlink(missing_ok=True)
+
+                try:
+                    os.unlink(acopy)
+                except FileNotFoundError:
+                    pass
         except Exception as e:
             Log.error(str(e), self.__clean_acopy, CustomValueError)  # type:ignore[arg-type]
+        else:
+            self._cleaned_acopy_dirs.add(parent)
 
-    def _get_audio_codec(self, encoder: Encoder) -> str:
-        encoder_map = {
-            "qaac": "qaac",
-            "flac": "libflac",
-            "opus": "libopus"
-        }
+    def __remove_acopies(self) -> None:
+        """Remove the acopy files made by `_encode_track`."""
+        while self._acopy_files:
+            acopy = self._acopy_files.pop()
 
-        codec = encoder_map.get(str(encoder.__name__).lower())
+            Log.debug(f"Unlinking file \"{acopy}\"...", self.encode_audio)
+
+            try:
+                os.unlink(acopy)
+            except FileNotFoundError:
+                pass
+
+    def _get_audio_codec(self, encoder: Encoder) -> str:
+        codec = _ENCODER_CODECS.get(encoder.__name__.lower())
 
         if not codec:
             Log.error(
@@ -509,11 +1209,105 @@ class _AudioEncoder(_BaseEncoder):
 
         return str(codec)
 
-    # TODO:
-    def _check_dupe_audio(self, atracks: list[AudioTrack]) -> list[AudioTrack]:
+    def _check_dupe_audio(
+        self, atracks: list[AudioTrack], decoded: bool = False, acoustic: bool = False
+    ) -> list[AudioTrack]:
         """
         Compares the hashes of every audio track and removes duplicate tracks.
         Theoretically, if a track is an exact duplicate of another, the hashes should match.
+
+        If `decoded` is True, also compare hashes of the decoded audio (requires `ffmpeg`),
+        to catch the same audio stored in a different container or with different metadata.
+        If `acoustic` is True, also compare Chromaprint fingerprints (requires `fpcalc`) to catch re-encodes.
+        Note that this also matches downmixes of the same audio, so it's not enabled by default.
         """
 
-        return []
+        # Only files of the exact same size can be duplicates, so most tracks never need to be read at all.
+        keys: list[tuple[Any, ...]] = [(os.path.getsize(atrack.file),) for atrack in atracks]
+
+        # Tracks that differ almost always do so early on, so compare the first chunk before hashing the full file.
+        for limit in (_HASH_CHUNK_SIZE, None):
+            counts = Counter(keys)
+
+            keys = [
+                (*key, _hash_file(atrack.file, limit)) if counts[key] > 1 else key
+                for atrack, key in zip(atracks, keys)
+            ]
+
+        seen = set[tuple[Any, ...]]()
+        deduped = list[AudioTrack]()
+
+        for atrack, key in zip(atracks, keys):
+            # Only fully hashed keys can belong to a duplicate.
+            if len(key) == 3:
+                if key in seen:
+                    Log.warn(f"Duplicate audio track found, skipping \"{atrack.file}\"...", self._check_dupe_audio)
+                    continue
+
+                seen.add(key)
+
+            deduped += [atrack]
+
+        if decoded:
+            deduped = self._check_dupe_audio_decoded(deduped)
+
+        if acoustic:
+            deduped = self._check_dupe_audio_acoustic(deduped)
+
+        return deduped
+
+    def _check_dupe_audio_decoded(self, atracks: list[AudioTrack]) -> list[AudioTrack]:
+        """Remove tracks whose decoded audio is identical to that of an earlier track."""
+        if not shutil.which("ffmpeg"):
+            Log.error(
+                "The executable for \"ffmpeg\" could not be found! Install FFmpeg to compare decoded audio!",
+                self._check_dupe_audio, CustomRuntimeError
+            )
+
+        # Decoding is bound by the disk and a single core per track, so every track gets decoded side by side.
+        digests = _get_executor().map(_pcm_digest, [atrack.file for atrack in atracks])
+
+        seen = set[bytes]()
+        deduped = list[AudioTrack]()
+
+        for atrack, digest in zip(atracks, digests):
+            if digest is not None:
+                if digest in seen:
+                    Log.warn(f"Duplicate decoded audio found, skipping \"{atrack.file}\"...", self._check_dupe_audio)
+                    continue
+
+                seen.add(digest)
+
+            deduped += [atrack]
+
+        return deduped
+
+    def _check_dupe_audio_acoustic(self, atracks: list[AudioTrack]) -> list[AudioTrack]:
+        """Remove tracks whose Chromaprint fingerprint is near-identical to that of an earlier track."""
+        if not shutil.which("fpcalc"):
+            Log.error(
+                "The executable for \"fpcalc\" could not be found! Install Chromaprint to compare fingerprints!",
+                self._check_dupe_audio, CustomRuntimeError
+            )
+
+        # Maps every sub-fingerprint to the kept tracks it appears in, so only tracks sharing one get compared.
+        index = dict[int, list[int]]()
+        kept = list[tuple[AudioTrack, tuple[int, ...]]]()
+
+        for atrack in atracks:
+            if not (fp := _fingerprint_audio(atrack.file)):
+                kept += [(atrack, fp)]
+                continue
+
+            candidates = {k for sub_fp in fp for k in index.get(sub_fp, ())}
+
+            if any(_fingerprint_error_rate(fp, kept[k][1]) <= _FINGERPRINT_MAX_ERROR for k in candidates):
+                Log.warn(f"Acoustic duplicate audio track found, skipping \"{atrack.file}\"...", self._check_dupe_audio)
+                continue
+
+            for sub_fp in set(fp):
+                index.setdefault(sub_fp, []).append(len(kept))
+
+            kept += [(atrack, fp)]
+
+        return [atrack for atrack, _ in kept]
@@ -1,5 +1,8 @@
 import filecmp
+import hashlib
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Callable
 
 from vstools import CustomRuntimeError, SPath, SPathLike, finalize_clip, vs
@@ -12,6 +15,10 @@ __all__: list[str] = [
 ]
 
 
+_PID_RE = re.compile(r"PID (\d+)")
+"""Matches the PID DGIndex(NV) writes into the names of demuxed tracks."""
+
+
 class _BaseEncoder:
     """Class containing the base components of all the encoder child frameworks."""
 
@@ -51,14 +58,27 @@ class _BaseEncoder:
         if len(files) < 2:
             raise Log.error("You must compare at least two files!", caller)
         elif len(files) == 2:
+            # filecmp compares the sizes first and stops at the first differing chunk.
             return filecmp.cmp(*files, shallow=bool(shallow))
 
-        # TODO: Add support for multiple files
-        return False
+        if shallow:
+            return all(filecmp.cmp(files[0], f, shallow=True) for f in files[1:])
+
+        # Files of different sizes can never be identical, so those don't have to be read at all.
+        if len({os.path.getsize(f) for f in files}) > 1:
+            return False
+
+        def _digest(file: SPath) -> bytes:
+            with open(file, "rb") as f:
+                return hashlib.file_digest(f, "blake2b").digest()
+
+        # Hashing every file once is cheaper than comparing every pair, and the hashes are computed side by side.
+        with ThreadPoolExecutor(max_workers=min(len(files), os.cpu_count() or 1)) as executor:
+            return len(set(executor.map(_digest, files))) == 1
 
     @staticmethod
     def extract_pid(filename: SPathLike) -> str:
-        if not (match := re.search(r"PID (\d+)", SPath(filename).to_str())):
+        if not (match := _PID_RE.search(os.fspath(filename))):
             return ""
 
         return bin(int(match.group(1)))[2:].zfill(16)
@@ -139,10 +139,7 @@ def get_chapter_frames(
         Log.warn("Could not find chapters.", func)
         return
 
-    ch_ranges = []
+    # Every chapter's start doubles as the previous chapter's end, so only convert each timestamp once.
+    ch_frames = [timedelta_to_frame(start_time, fps) for start_time, _ in chs.chapters]
 
-    for i, (start_time, _) in enumerate(chs.chapters):
-        end_time = chs.chapters[i + 1][0] if i + 1 < len(chs.chapters) else None
-        ch_ranges += [(timedelta_to_frame(start_time), end_time if end_time is None else timedelta_to_frame(end_time))]
-
-    return ch_ranges
+    return list(zip(ch_frames, [*ch_frames[1:], None]))
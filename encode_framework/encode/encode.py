@@ -1,4 +1,5 @@
 import re
+from threading import Lock
 from typing import Any, cast
 
 from muxtools import get_setup_attr
@@ -38,6 +39,11 @@ class Encoder(_AudioEncoder, _Chapters, _Subtitles, _VideoEncoder):
 
         self.video_file = None  # type:ignore
 
+        # Set per instance, so tracks from one encoder don't end up in every other encoder.
+        self.audio_files = []
+        self.audio_tracks = []
+        self._audio_lock = Lock()
+
     def pre_encode(self) -> None:
         """Tasks to perform prior to encoding."""
 
@@ -61,6 +67,9 @@ class Encoder(_AudioEncoder, _Chapters, _Subtitles, _VideoEncoder):
         """
         from muxtools.muxing.mux import mux as vsmux  # type:ignore[import]
 
+        # Audio may still be encoding in the background if `encode_audio_async` was used.
+        self._wait_for_audio()
+
         if self.script_info.tc_path and self.script_info.tc_path.exists():
             Log.info(f"Timecode file found at \"{self.script_info.tc_path}\"!", self.mux)
 
@@ -1,3 +1,4 @@
+import os
 from typing import Any, Callable
 
 from vstools import SPath, SPathLike
@@ -27,12 +28,21 @@ class _FindSubtitles(_BaseSubtitles):
         else:
             dgi_file = self.script_info.src_file[0]
 
-        if not dgi_file.to_str().endswith(".dgi"):
+        if dgi_file.suffix.lower() != ".dgi":
             Log.error("Input file is not a dgi file, not returning any subs.", self.find_sub_files)
 
             return []
 
-        self._find(dgi_file.parent.glob(f"{dgi_file.stem}*.*"), self.find_sub_files)
+        stem = dgi_file.stem.lower()
+
+        # Same as globbing `{stem}*.*`, but [] and () in the stem don't need escaping.
+        with os.scandir(dgi_file.parent) as entries:
+            files = [
+                SPath(entry.path) for entry in entries
+                if (name := entry.name.lower()).startswith(stem) and "." in name[len(stem):]
+            ]
+
+        self._find(files, self.find_sub_files)
 
         if not self.subtitle_files:
             return []
@@ -6,7 +6,7 @@ from shutil import which
 from typing import Any, Literal, cast
 
 from discord_webhook import DiscordEmbed, DiscordWebhook
-from pymediainfo import MediaInfo, Track  # type:ignore[import]
+from pymediainfo import Track  # type:ignore[import]
 from pyupload.uploader import CatboxUploader  # type:ignore
 from requests import Response  # type:ignore[import]
 from vsmuxtools.video import fill_props
@@ -16,7 +16,7 @@ from vstools import CustomValueError, SPath, SPathLike, vs
 from ..config import get_items, get_option
 from ..encode import Encoder
 from ..script import ScriptInfo
-from ..util import Log, markdownify
+from ..util import Log, get_mediainfo, markdownify
 from .anilist import AniList, AniListAnime
 from .ftp import Ftp
 
@@ -447,7 +447,7 @@ class DiscordEmbedder(DiscordWebhook):
         tracks: list[tuple[str, str]] = []
 
         try:
-            for track in MediaInfo.parse(premux_path).tracks:
+            for track in get_mediainfo(premux_path).tracks:
                 assert isinstance(track, Track), f"Track {track} is not a track!"
 
                 if track.track_type == "General":
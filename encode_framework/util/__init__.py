@@ -4,4 +4,5 @@ from .checks import *
 from .download import *
 from .files import *
 from .logging import *
+from .mediainfo import *
 from .misc import *
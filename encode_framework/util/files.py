@@ -1,12 +1,42 @@
+import os
+from functools import lru_cache, wraps
+from typing import Any, Callable, TypeVar
 
-from vstools import SPath
+from vstools import SPath, SPathLike
 
 __all__: list[str] = [
     "get_script_path",
+    "stat_cache",
 ]
 
+T = TypeVar("T")
+
 
 def get_script_path() -> SPath:
     import __main__
 
     return SPath(__main__.__file__)
+
+
+def stat_cache(maxsize: int = 128) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """
+    Cache the results of a function that reads a file, for as long as that file is unchanged.
+
+    The decorated function gets the path as a string, and results are keyed on it alongside the file's mtime and size.
+    Any further arguments are part of the key as well, and must be hashable and passed positionally.
+    """
+
+    def _decorator(func: Callable[..., T]) -> Callable[..., T]:
+        @lru_cache(maxsize=maxsize)
+        def _cached(path: str, mtime_ns: int, size: int, *args: Any) -> T:
+            return func(path, *args)
+
+        @wraps(func)
+        def _wrapper(path: SPathLike, *args: Any) -> T:
+            st = os.stat(path)
+
+            return _cached(os.fspath(path), st.st_mtime_ns, st.st_size, *args)
+
+        return _wrapper
+
+    return _decorator
@@ -1,10 +1,12 @@
 import logging  # type:ignore[import]
 import sys
+import threading
 import time
 from configparser import ConfigParser
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable, Literal
+from typing import Any, Callable, Iterator, Literal
 
 from rich.logging import RichHandler
 from vstools import CustomError
@@ -34,6 +36,9 @@ class Logger:
     ) -> None:
         log_name = logger_name or "Encode_Framework"
 
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
         self._config_file = Path() / "config.ini"
 
         config = ConfigParser()
@@ -98,51 +103,80 @@ class Logger:
             .replace("[bold]", "") \
             .replace("[/]", "")
 
-        self.log_file.parent.mkdir(parents=True, exist_ok=True)
-        self.log_file.touch(exist_ok=True)
+        # Opening in append mode creates the file, so only the directory has to be made (once).
+        if not getattr(self, "_log_dir_ready", False):
+            self.log_file.parent.mkdir(parents=True, exist_ok=True)
+            self._log_dir_ready = True
 
         with open(self.log_file, "a") as f:
             f.write(f"{datetime.now()} | [{str(caller).upper()}] {formatted_msg}\n")
 
+    def _output(self, log_func: Callable[[str], None], message: str, caller: Callable[..., Any]) -> None:
+        if self.log_file:
+            self._write(message, caller)
+
+        log_func(message)
+
+    def _emit(self, log_func: Callable[[str], None], message: str, caller: Callable[..., Any]) -> None:
+        if (buffer := getattr(self._local, "buffer", None)) is not None:
+            buffer += [(log_func, message, caller)]
+        else:
+            self._output(log_func, message, caller)
+
+    def _flush(self) -> None:
+        if not (buffer := getattr(self._local, "buffer", None)):
+            return
+
+        with self._lock:
+            for log_func, message, caller in buffer:
+                self._output(log_func, message, caller)
+
+        buffer.clear()
+
+    @contextmanager
+    def buffered(self) -> Iterator[None]:
+        """
+        Hold back everything the current thread logs until the block exits, then output it all at once.
+
+        Useful when running multiple jobs at the same time, so their output doesn't get interleaved.
+        Errors flush the buffer immediately.
+        """
+        self._local.buffer = []
+
+        try:
+            yield
+        finally:
+            self._flush()
+            self._local.buffer = None
+
     def crit(self, msg: str | bytes, caller: str | Callable[[Any], Any] | None = None) -> Exception:
         message = self._format_msg(msg, caller)
 
-        if self.log_file:
-            self._write(message, self.crit)
-
-        self.logger.critical(message)
+        self._emit(self.logger.critical, message, self.crit)
 
         return Exception(message)
 
     def debug(self, msg: str | bytes, caller: str | Callable[[Any], Any] | None = None, force: bool = False) -> None:
-        if not self._config_file.exists():
+        # Cheap level check first so disabled debug calls never touch the filesystem.
+        if not self.is_debug and not force:
             return
 
-        if not self.is_debug and not force:
+        if not self._config_file.exists():
             return
 
         message = self._format_msg(msg, caller)
 
-        if self.log_file:
-            self._write(message, self.debug)
-
-        self.logger.debug(message)
+        self._emit(self.logger.debug, message, self.debug)
 
     def info(self, msg: str | bytes, caller: str | Callable[[Any], Any] | None = None) -> None:
         message = self._format_msg(msg, caller)
 
-        if self.log_file:
-            self._write(message, self.info)
-
-        self.logger.info(message)
+        self._emit(self.logger.info, message, self.info)
 
     def warn(self, msg: str | bytes, caller: str | Callable[[Any], Any] | None = None, sleep: int = 0) -> None:
         message = self._format_msg(msg, caller)
 
-        if self.log_file:
-            self._write(message, self.warn)
-
-        self.logger.warning(message)
+        self._emit(self.logger.warning, message, self.warn)
 
         if sleep:
             time.sleep(sleep)
@@ -153,10 +187,8 @@ class Logger:
     ) -> Exception:
         message = self._format_msg(msg, caller)
 
-        if self.log_file:
-            self._write(message, self.error)
-
-        self.logger.error(message)
+        self._flush()
+        self._output(self.logger.error, message, self.error)
 
         sys.tracebacklimit = tb_limit
 
@@ -168,10 +200,7 @@ class Logger:
     def exit(self, msg: str | bytes, caller: str | Callable[[Any], Any] | None = None) -> None:
         message = self._format_msg(msg, caller)
 
-        if self.log_file:
-            self._write(message, self.exit)
-
-        self.logger.info(message)
+        self._emit(self.logger.info, message, self.exit)
 
         sys.exit(0)
 
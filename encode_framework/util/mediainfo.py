@@ -0,0 +1,18 @@
+from pymediainfo import MediaInfo  # type:ignore[import]
+from vstools import SPathLike
+
+from .files import stat_cache
+
+__all__: list[str] = [
+    "get_mediainfo",
+]
+
+
+@stat_cache(maxsize=512)
+def _parse_mediainfo(path: str) -> MediaInfo:
+    return MediaInfo.parse(path)
+
+
+def get_mediainfo(path: SPathLike) -> MediaInfo:
+    """Parse the MediaInfo of a file, reusing the previous result for as long as the file is unchanged."""
+    return _parse_mediainfo(path)